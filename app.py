@@ -1,20 +1,54 @@
 from flask import Flask, render_template, request, redirect, url_for
 from collections import defaultdict
+import hashlib
 import json
 import os
-from datetime import datetime
+import re
+import tempfile
+from shutil import copyfileobj
+from datetime import date, datetime
 import calendar
+from operator import itemgetter
 from werkzeug.utils import secure_filename
 
+try:
+    import orjson  # optional: much faster parse/dump of entries.json
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 
 DATA_FILE = "entries.json"
 
 UPLOAD_FOLDER = os.path.join("static", "uploads")
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB copies instead of Werkzeug's 16 KiB default
+
+# Reject oversized uploads before any of the body is read (Flask answers 413)
+app.config["MAX_CONTENT_LENGTH"] = 32 * 1024 * 1024
+
+# Lowercased category names / tags that put an entry on the dreamboard
+DREAM_CATS = frozenset({"goal", "goals", "dreams", "dreamboard"})
+DREAM_KEYWORDS = frozenset({"dream", "dreams", "goal", "goals", "manifest", "manifestation"})
+
+# /dreamboard uses a slightly narrower rule than the gallery's dream strip
+DREAMBOARD_CATS = frozenset({"goal", "goals"})
+DREAMBOARD_KEYWORDS = frozenset({"dream", "goal", "goals", "manifest", "manifestation"})
+PRIORITIES = ("High", "Medium", "Low")
+
+SEARCH_TOKEN_RE = re.compile(r"\w+")
+
+MONTH_NAMES = tuple(calendar.month_name)  # index 0 is ""
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Parsed entries.json, reused until the file's mtime changes.
+# Callers treat the returned list as shared: mutate it only right before save_entries().
+_ENTRIES_CACHE = {"mtime": None, "data": None}
+# (version, value) pairs, swapped in one assignment so threads never see them mismatched
+_SIDEBAR_CACHE = {"entry": (None, None)}
+_INDEX_CACHE = {"entry": (None, None)}
+
 
 # ---------- Helpers ----------
 
@@ -22,19 +56,112 @@ def allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def save_upload(file):
+    """Save an uploaded image and return its path under static/ ("" if none was saved).
+
+    The filename is prefixed with a hash of the content, so different images
+    with the same name never overwrite each other and re-uploads of the same
+    image reuse the file already on disk.
+    """
+    if not (file and file.filename and allowed_file(file.filename)):
+        return ""
+
+    digest = hashlib.blake2b(digest_size=8)
+    for chunk in iter(lambda: file.stream.read(UPLOAD_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    file.stream.seek(0)
+
+    filename = f"{digest.hexdigest()}_{secure_filename(file.filename)}"
+    save_path = os.path.join(UPLOAD_FOLDER, filename)
+    if not os.path.exists(save_path):
+        # Write under a temp name and rename, so a failed write never leaves a
+        # truncated file at the hashed name (later re-uploads would skip it)
+        fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_FOLDER, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb", buffering=UPLOAD_CHUNK_SIZE) as out:
+                copyfileobj(file.stream, out, length=UPLOAD_CHUNK_SIZE)
+            os.chmod(tmp_path, 0o644)  # served as a static file
+            os.replace(tmp_path, save_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+    return os.path.join("uploads", filename)
+
+
+def _parse_ymd(s):
+    """Parse a "YYYY-MM-DD" string to a date, or return None if it isn't one."""
+    if not s:
+        return None
+    try:
+        digits = s[:4] + s[5:7] + s[8:]
+        if len(s) == 10 and s[4] == s[7] == "-" and digits.isascii() and digits.isdigit():
+            # canonical form: skip strptime's format parsing
+            return date(int(s[:4]), int(s[5:7]), int(s[8:]))
+        return datetime.strptime(s, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_text(value):
+    """Return value as a string for lookups (None → "")."""
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def _derive_fields(e):
+    """Attach lowercased lookup fields (underscore keys are never saved)."""
+    e["_cat_lc"] = _as_text(e.get("category")).lower()
+    e["_sub_lc"] = _as_text(e.get("subcategory")).lower()
+    # Tolerate hand-edited data: null tags, or non-string values inside them
+    tags = [t for t in (e.get("tags") or []) if isinstance(t, str)]
+    e["_tags_lc"] = frozenset(t.lower() for t in tags)
+
+    # Everything /search looks at, as one lowercased string
+    text_bits = [
+        _as_text(e.get("title")),
+        _as_text(e.get("notes")),
+        _as_text(e.get("mood")),
+        _as_text(e.get("category")),
+        _as_text(e.get("subcategory")),
+        " ".join(tags),
+    ]
+    e["_search_lc"] = " ".join(text_bits).lower()
+
+    try:
+        e["_dream_progress_int"] = int(e.get("dream_progress") or 0)
+    except (TypeError, ValueError):
+        e["_dream_progress_int"] = 0
+
+    e["_target_date"] = _parse_ymd(e.get("dream_target_date"))
+
+
 def load_entries():
     """Load all entries from the JSON file and ensure new keys exist."""
-    if not os.path.exists(DATA_FILE):
+    try:
+        mtime = os.stat(DATA_FILE).st_mtime_ns
+    except FileNotFoundError:
         return []
 
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        try:
-            entries = json.load(f)
-        except json.JSONDecodeError:
-            return []
+    # Cached entries were normalized when they were (re)loaded
+    if mtime == _ENTRIES_CACHE["mtime"]:
+        return _ENTRIES_CACHE["data"]
+
+    with open(DATA_FILE, "rb") as f:
+        data = f.read()
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        entries = orjson.loads(data) if orjson else json.loads(data)
+    except json.JSONDecodeError:
+        return []
 
-    # Ensure all entries have the new keys
+    # Ensure all entries have the new keys (save_entries persists them, so
+    # older files only need this once)
     for e in entries:
+        e.setdefault("date", "")              # sort key for every listing
         e.setdefault("category", "Art")       # generic default
         e.setdefault("subcategory", "")       # e.g. "Spiritual"
         e.setdefault("tags", [])
@@ -45,12 +172,62 @@ def load_entries():
         e.setdefault("dream_target_date", "") # "2025-12-31"
         e.setdefault("dream_progress", 0)     # integer 0–100
 
+        # Sort keys must be strings: setdefault leaves an explicit null in
+        # place, and one odd row would break the shared index for every view
+        e["date"] = _as_text(e["date"] or "")
+        e["dream_target_date"] = _as_text(e["dream_target_date"] or "")
+
+        _derive_fields(e)
+
+    # data before mtime, so a concurrent reader never pairs the new mtime with old data
+    _ENTRIES_CACHE["data"] = entries
+    _ENTRIES_CACHE["mtime"] = mtime
     return entries
 
 
 def save_entries(entries):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2, ensure_ascii=False)
+    """Write entries atomically: dump to a unique temp file, then rename over DATA_FILE.
+
+    Pretty-printed only in debug mode; otherwise compact to cut the bytes written.
+    """
+    public = [{k: v for k, v in e.items() if not k.startswith("_")} for e in entries]
+    if orjson:
+        data = orjson.dumps(public, option=orjson.OPT_INDENT_2 if app.debug else 0)
+    elif app.debug:
+        data = json.dumps(public, indent=2, ensure_ascii=False).encode("utf-8")
+    else:
+        data = json.dumps(public, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    # A unique temp file per save, so concurrent writers never share one
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(DATA_FILE)),
+        prefix=os.path.basename(DATA_FILE) + ".",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates the file 0600; keep the data file's permissions
+        try:
+            os.chmod(tmp_path, os.stat(DATA_FILE).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, DATA_FILE)
+    except BaseException:
+        # Routes change the cached list in place before saving; forget it so
+        # the next read goes back to what is actually on disk.
+        _ENTRIES_CACHE["mtime"] = None
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    # Keep the cache in step with what we just wrote (new/edited entries too)
+    for e in entries:
+        _derive_fields(e)
+    _ENTRIES_CACHE["data"] = entries
+    _ENTRIES_CACHE["mtime"] = os.stat(DATA_FILE).st_mtime_ns
 
 
 def next_id(entries):
@@ -60,47 +237,164 @@ def next_id(entries):
     return max(existing_ids) + 1
 
 
+def _entries_version(entries):
+    """Cache key for views derived from entries: the list plus the file it was saved to."""
+    return (id(entries), _ENTRIES_CACHE["mtime"])
+
+
+def is_reflection(e):
+    """Daily reflections are Life diary entries with the "Daily reflection" subcategory."""
+    return (
+        e.get("category") == "Life diary"
+        and e.get("subcategory") == "Daily reflection"
+    )
+
+
+def _milestone_sort_key(e):
+    return (-e["_dream_progress_int"], e["dream_target_date"])
+
+
+def _entry_index(entries):
+    """Return derived views of entries, rebuilt only when entries.json changes.
+
+    - by_id: id → entry (first one wins if ids repeat)
+    - by_date: all entries, newest first (stable, like the old per-view sorts)
+    - by_cat / by_sub: lowercased category / subcategory → entries, newest first
+    - dreamboard: /dreamboard entries, by target date then date
+    - milestones: /milestones entries, highest progress first
+    - reflections: daily reflections, newest first
+    - inverted: search token → positions in by_date
+    """
+    version = _entries_version(entries)
+    cached_version, cached_value = _INDEX_CACHE["entry"]
+    if cached_version == version:
+        return cached_value
+
+    dreamboard = [
+        e for e in entries
+        if e["_cat_lc"] in DREAMBOARD_CATS or DREAMBOARD_KEYWORDS & e["_tags_lc"]
+    ]
+    milestones = [
+        e for e in entries
+        if e["_dream_progress_int"] >= 80 or "milestone" in e["_tags_lc"]
+    ]
+
+    by_date = sorted(entries, key=itemgetter("date"), reverse=True)
+    by_cat = defaultdict(list)
+    by_sub = defaultdict(list)
+    inverted = defaultdict(set)
+    for pos, e in enumerate(by_date):
+        by_cat[e["_cat_lc"]].append(e)
+        by_sub[e["_sub_lc"]].append(e)
+        for token in SEARCH_TOKEN_RE.findall(e["_search_lc"]):
+            inverted[token].add(pos)
+
+    value = {
+        "by_id": {e["id"]: e for e in reversed(entries) if "id" in e},
+        "by_date": by_date,
+        "by_cat": dict(by_cat),
+        "by_sub": dict(by_sub),
+        "inverted": dict(inverted),
+        "dreamboard": sorted(dreamboard, key=itemgetter("dream_target_date", "date")),
+        "milestones": sorted(milestones, key=_milestone_sort_key),
+        "reflections": [e for e in by_date if is_reflection(e)],
+    }
+    _INDEX_CACHE["entry"] = (version, value)
+    return value
+
+
 def compute_dream_entries(entries):
     """Return entries that should appear on the dreamboard (sorted newest first)."""
-    dream_keywords = {"dream", "dreams", "goal", "goals", "manifest", "manifestation"}
-    result = []
+    # Treat "Goals", "Dreams", "Dreamboard" as special notebooks
+    return [
+        e for e in _entry_index(entries)["by_date"]
+        if e["_cat_lc"] in DREAM_CATS or DREAM_KEYWORDS & e["_tags_lc"]
+    ]
 
-    for e in entries:
-        cat = (e.get("category") or "").lower()
-        tags = [t.lower() for t in e.get("tags", [])]
 
-        # Treat "Goals", "Dreams", "Dreamboard" as special notebooks
-        if cat in {"goal", "goals", "dreams", "dreamboard"}:
-            result.append(e)
-        elif dream_keywords.intersection(tags):
-            result.append(e)
+def search_entries(entries, q):
+    """Return entries whose search text contains q (already lowercased), newest first.
+
+    Keeps plain substring semantics. Each word run in q must sit inside some
+    token of a matching entry, so the inverted index narrows the candidates
+    and the substring test only runs on those.
+    """
+    index = _entry_index(entries)
+    by_date = index["by_date"]
+
+    candidates = None
+    for run in SEARCH_TOKEN_RE.findall(q):
+        hits = set()
+        for token, positions in index["inverted"].items():
+            if run in token:
+                hits |= positions
+        candidates = hits if candidates is None else candidates & hits
+        if not candidates:
+            return []
 
-    return sorted(result, key=lambda e: e.get("date", ""), reverse=True)
+    positions = range(len(by_date)) if candidates is None else sorted(candidates)
+    return [by_date[i] for i in positions if q in by_date[i]["_search_lc"]]
 
 
-def build_sidebar(entries):
-    """Return (categories, subcategories, category_subcats) for the sidebar."""
-    categories = sorted(
-        {e.get("category", "Art") for e in entries if e.get("category")}
-    )
-    subcategories = sorted(
-        {e.get("subcategory", "") for e in entries if e.get("subcategory")}
-    )
+def _sidebar_context(entries):
+    """Return the sidebar template kwargs (categories, subcategories, category_subcats).
+
+    Built in a single pass and memoized per entries version, since it only
+    changes when entries.json is written.
+    """
+    version = _entries_version(entries)
+    cached_version, cached_value = _SIDEBAR_CACHE["entry"]
+    if cached_version == version:
+        return cached_value
 
-    category_subcats = {}
+    cats = set()
+    subs = set()
+    cat_subs = defaultdict(set)
     for e in entries:
         c = e.get("category")
         s = e.get("subcategory")
+        if c:
+            cats.add(c)
+        if s:
+            subs.add(s)
         if c and s:
-            category_subcats.setdefault(c, set()).add(s)
+            cat_subs[c].add(s)
+
+    value = {
+        "categories": sorted(cats),
+        "subcategories": sorted(subs),
+        # Convert sets → sorted lists
+        "category_subcats": {c: sorted(ss) for c, ss in cat_subs.items()},
+    }
+    _SIDEBAR_CACHE["entry"] = (version, value)
+    return value
+
+
+# Warm the caches at import time. Under `gunicorn --preload -w N app:app` this
+# runs once in the master, and workers inherit the parsed entries on fork.
+# Each worker still stats entries.json per request, so writes made by another
+# worker are picked up on its next load_entries() call.
+def _warm_caches():
+    try:
+        entries = load_entries()
+        _sidebar_context(entries)
+        _entry_index(entries)
+    except Exception:
+        # Bad data should fail the requests that touch it, not stop the app from starting
+        app.logger.exception("Could not warm the entries cache at startup")
 
-    # Convert sets → sorted lists
-    category_subcats = {c: sorted(list(subs)) for c, subs in category_subcats.items()}
-    return categories, subcategories, category_subcats
+
+_warm_caches()
 
 
 # ---------- Routes ----------
 
+@app.context_processor
+def _inject_sidebar():
+    """Give every template categories / subcategories / category_subcats."""
+    return _sidebar_context(load_entries())
+
+
 @app.route("/")
 def home():
     entries = load_entries()
@@ -111,77 +405,40 @@ def home():
         f"Today is {today_str}. Even one tiny note or dream update keeps your gallery alive. 🌱"
     )
 
-    categories, subcategories, category_subcats = build_sidebar(entries)
-
     return render_template(
         "home.html",
         current_page="home",
         entries=entries,
         daily_message=daily_message,
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
     )
 
 
 @app.route("/gallery")
 def index():
     entries = load_entries()
-
-    # --- helper: is this a daily reflection? ---
-    def is_reflection(e):
-        return (
-            e.get("category") == "Life diary"
-            and e.get("subcategory") == "Daily reflection"
-        )
+    index = _entry_index(entries)
 
     # --- dreams vs regular entries ---
     dream_entries = compute_dream_entries(entries)  # already sorted (newest first)
+    # identity, not equality: both lists hold the same dict objects
+    dream_ids = {id(e) for e in dream_entries}
 
     # REGULAR gallery entries:
     #  - exclude dream entries
     #  - exclude daily reflections (those will live in the reflections strip only)
-    regular_entries = [
-        e for e in entries
-        if e not in dream_entries and not is_reflection(e)
+    regular_entries_sorted = [
+        e for e in index["by_date"]
+        if id(e) not in dream_ids and not is_reflection(e)
     ]
 
-    regular_entries_sorted = sorted(
-        regular_entries,
-        key=lambda e: e.get("date", ""),
-        reverse=True,
-    )
-
     # Recent reflections strip (latest few reflections)
-    reflections = sorted(
-        [e for e in entries if is_reflection(e)],
-        key=lambda e: e.get("date", ""),
-        reverse=True,
-    )[:5]   # show up to 5; change number if you want
-
-    # Sidebar data (same as before)
-    categories = sorted({e.get("category", "Art") for e in entries if e.get("category")})
-    subcategories = sorted({e.get("subcategory", "") for e in entries if e.get("subcategory")})
-
-    category_subcats = {}
-    for e in entries:
-        c = e.get("category")
-        s = e.get("subcategory")
-        if c and s:
-            category_subcats.setdefault(c, []).append(s)
-    category_subcats = {
-        c: sorted(set(subs))
-        for c, subs in category_subcats.items()
-    }
+    reflections = index["reflections"][:5]   # show up to 5; change number if you want
 
     return render_template(
         "index.html",
         entries=regular_entries_sorted,
         dream_entries=dream_entries,
         reflections=reflections,          # 👈 used by index.html
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
         current_category=None,
         current_subcategory=None,
         search_query=None,
@@ -194,54 +451,34 @@ def timeline():
     entries = load_entries()
 
     current_category = request.args.get("category")
+    index = _entry_index(entries)
 
     # Filter by chosen collection (if any)
     if current_category:
-        scoped_entries = [
-            e
-            for e in entries
-            if e.get("category", "").lower() == current_category.lower()
-        ]
+        scoped_entries = index["by_cat"].get(current_category.lower(), [])
     else:
-        scoped_entries = entries
-
-    dated_entries = [e for e in scoped_entries if e.get("date")]
-
-    dated_entries = sorted(
-        dated_entries, key=lambda e: e.get("date", ""), reverse=True
-    )
+        scoped_entries = index["by_date"]
 
-    grouped = defaultdict(lambda: defaultdict(list))
-    for e in dated_entries:
+    buckets = defaultdict(list)
+    for e in scoped_entries:
         d = e.get("date")
         if not d or len(d) < 7:
             continue
-        year = d[:4]
-        month = d[5:7]
-        grouped[year][month].append(e)
+        buckets[(d[:4], d[5:7])].append(e)
 
+    # (year, month) keys sort newest first; group them into years for the template
     timeline_years = []
-    for year in sorted(grouped.keys(), reverse=True):
-        months = grouped[year]
-        month_blocks = []
-        for month in sorted(months.keys(), reverse=True):
-            month_num = int(month)
-            month_name = calendar.month_name[month_num]
-            month_blocks.append(
-                {"month": month, "month_name": month_name, "entries": months[month]}
-            )
-
-        timeline_years.append({"year": year, "months": month_blocks})
-
-    categories, subcategories, category_subcats = build_sidebar(entries)
+    for year, month in sorted(buckets, reverse=True):
+        if not timeline_years or timeline_years[-1]["year"] != year:
+            timeline_years.append({"year": year, "months": []})
+        timeline_years[-1]["months"].append(
+            {"month": month, "month_name": MONTH_NAMES[int(month)], "entries": buckets[(year, month)]}
+        )
 
     return render_template(
         "timeline.html",
         current_page="timeline",
         timeline_years=timeline_years,
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
         current_category=current_category,
     )
 
@@ -249,22 +486,12 @@ def timeline():
 @app.route("/category/<name>")
 def category_view(name):
     entries = load_entries()
-    filtered = [
-        e for e in entries if e.get("category", "").lower() == name.lower()
-    ]
-    entries_sorted = sorted(
-        filtered, key=lambda e: e.get("date", ""), reverse=True
-    ) if filtered else []
-
-    categories, subcategories, category_subcats = build_sidebar(entries)
+    entries_sorted = _entry_index(entries)["by_cat"].get(name.lower(), [])
 
     return render_template(
         "index.html",
         entries=entries_sorted,
         dream_entries=[],
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
         current_category=name,
         current_subcategory=None,
         search_query=None,
@@ -274,22 +501,12 @@ def category_view(name):
 @app.route("/subcategory/<name>")
 def subcategory_view(name):
     entries = load_entries()
-    filtered = [
-        e for e in entries if e.get("subcategory", "").lower() == name.lower()
-    ]
-    entries_sorted = sorted(
-        filtered, key=lambda e: e.get("date", ""), reverse=True
-    ) if filtered else []
-
-    categories, subcategories, category_subcats = build_sidebar(entries)
+    entries_sorted = _entry_index(entries)["by_sub"].get(name.lower(), [])
 
     return render_template(
         "index.html",
         entries=entries_sorted,
         dream_entries=[],
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
         current_category=None,
         current_subcategory=name,
         search_query=None,
@@ -304,33 +521,12 @@ def search():
     if not query:
         return redirect(url_for("index"))
 
-    q = query.lower()
-
-    def matches(e):
-        text_bits = [
-            e.get("title", ""),
-            e.get("notes", ""),
-            e.get("mood", ""),
-            e.get("category", ""),
-            e.get("subcategory", ""),
-            " ".join(e.get("tags", [])),
-        ]
-        return q in " ".join(text_bits).lower()
-
-    filtered = [e for e in entries if matches(e)]
-    entries_sorted = sorted(
-        filtered, key=lambda e: e.get("date", ""), reverse=True
-    )
-
-    categories, subcategories, category_subcats = build_sidebar(entries)
+    entries_sorted = search_entries(entries, query.lower())
 
     return render_template(
         "index.html",
         entries=entries_sorted,
         dream_entries=[],
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
         current_category=None,
         current_subcategory=None,
         search_query=query,
@@ -342,15 +538,7 @@ def new_entry():
     entries = load_entries()
 
     if request.method == "POST":
-        image_path = ""
-
-        if "image_file" in request.files:
-            file = request.files["image_file"]
-            if file and file.filename and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                save_path = os.path.join(UPLOAD_FOLDER, filename)
-                file.save(save_path)
-                image_path = os.path.join("uploads", filename)
+        image_path = save_upload(request.files.get("image_file"))
 
         entry_id = next_id(entries)
 
@@ -376,36 +564,22 @@ def new_entry():
             "dream_theme": request.form.get("dream_theme", "").strip(),
         }
 
+        _derive_fields(entry)  # readers of the shared list expect derived fields
         entries.append(entry)
         save_entries(entries)
         return redirect(url_for("index"))
 
-    # -------- GET: build data for the sidebar & dropdowns --------
-    categories = sorted({e.get("category", "Art") for e in entries if e.get("category")})
-    subcategories = sorted({e.get("subcategory", "") for e in entries if e.get("subcategory")})
-
-    # build mapping { "Painting": ["Spiritual", "Abstract"], ... }
-    category_subcats = {}
-    for e in entries:
-        c = e.get("category")
-        s = e.get("subcategory")
-        if c and s:
-            category_subcats.setdefault(c, set()).add(s)
-    category_subcats = {c: sorted(list(s)) for c, s in category_subcats.items()}
-
+    # -------- GET: the form (sidebar & dropdown data come from _inject_sidebar) --------
     return render_template(
         "new.html",
         current_page="new_entry",
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
     )
 
 
 @app.route("/entry/<int:entry_id>")
 def entry_detail(entry_id):
     entries = load_entries()
-    entry = next((e for e in entries if e.get("id") == entry_id), None)
+    entry = _entry_index(entries)["by_id"].get(entry_id)
     if not entry:
         return "Entry not found", 404
     return render_template("detail.html", entry=entry)
@@ -414,27 +588,13 @@ def entry_detail(entry_id):
 @app.route("/entry/<int:entry_id>/edit", methods=["GET", "POST"])
 def edit_entry(entry_id):
     entries = load_entries()
-    entry = next((e for e in entries if e.get("id") == entry_id), None)
+    entry = _entry_index(entries)["by_id"].get(entry_id)
     if not entry:
         return "Entry not found", 404
 
-    # ensure keys exist for older entries
-    entry.setdefault("category", "Art")
-    entry.setdefault("subcategory", "")
-    entry.setdefault("tags", [])
-
-    categories, subcategories, _ = build_sidebar(entries)
-
     if request.method == "POST":
-        image_path = entry.get("image_path", "")
-
-        if "image_file" in request.files:
-            file = request.files["image_file"]
-            if file and file.filename and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                save_path = os.path.join(UPLOAD_FOLDER, filename)
-                file.save(save_path)
-                image_path = os.path.join("uploads", filename)
+        # keep the current image unless a new one was uploaded
+        image_path = save_upload(request.files.get("image_file")) or entry.get("image_path", "")
 
         raw_tags = request.form.get("tags", "")
         tags = [t.strip() for t in raw_tags.split(",") if t.strip()]
@@ -464,16 +624,15 @@ def edit_entry(entry_id):
         "edit.html",
         entry=entry,
         tags_str=tags_str,
-        categories=categories,
-        subcategories=subcategories,
     )
 
 
 @app.route("/entry/<int:entry_id>/delete", methods=["POST"])
 def delete_entry(entry_id):
     entries = load_entries()
-    new_entries = [e for e in entries if e.get("id") != entry_id]
-    save_entries(new_entries)
+    if entry_id in _entry_index(entries)["by_id"]:
+        new_entries = [e for e in entries if e.get("id") != entry_id]
+        save_entries(new_entries)
     return redirect(url_for("index"))
 
 
@@ -508,75 +667,51 @@ def new_dream():
             "dream_target_date": dream_target_date,
         }
 
+        _derive_fields(entry)  # readers of the shared list expect derived fields
         entries.append(entry)
         save_entries(entries)
         return redirect(url_for("dreamboard"))
 
     themes = ["Career", "Travel", "Art", "Wellbeing", "Spiritual", "Growth"]
-    priorities = ["High", "Medium", "Low"]
-
-    return render_template("new_dream.html", themes=themes, priorities=priorities)
+    return render_template("new_dream.html", themes=themes, priorities=PRIORITIES)
 
 
 @app.route("/dreamboard")
 def dreamboard():
     entries = load_entries()
 
-    dream_keywords = {"dream", "goal", "goals", "manifest", "manifestation"}
-
-    dream_entries = []
-    for e in entries:
-        cat = (e.get("category") or "").lower()
-        tags = [t.lower() for t in e.get("tags", [])]
-        if cat in {"goal", "goals"} or dream_keywords.intersection(tags):
-            dream_entries.append(e)
-
-    for e in dream_entries:
-        e.setdefault("dream_theme", e.get("category", ""))
-        e.setdefault("dream_priority", "")
-        e.setdefault("dream_target_date", "")
-        e.setdefault("dream_progress", 0)
+    # already sorted by target date; filtering below keeps that order
+    dream_entries = _entry_index(entries)["dreamboard"]
 
     current_theme = request.args.get("theme") or None
     current_priority = request.args.get("priority") or None
 
     themes = sorted({e.get("dream_theme") for e in dream_entries if e.get("dream_theme")})
-    priorities = ["High", "Medium", "Low"]
 
     if current_theme:
+        theme_lc = current_theme.lower()
         dream_entries = [
             e
             for e in dream_entries
-            if (e.get("dream_theme") or "").lower() == current_theme.lower()
+            if (e.get("dream_theme") or "").lower() == theme_lc
         ]
 
     if current_priority:
+        priority_lc = current_priority.lower()
         dream_entries = [
             e
             for e in dream_entries
-            if (e.get("dream_priority") or "").lower() == current_priority.lower()
+            if (e.get("dream_priority") or "").lower() == priority_lc
         ]
 
-    def dream_sort_key(e):
-        target = e.get("dream_target_date") or ""
-        date = e.get("date") or ""
-        return (target, date)
-
-    dream_entries = sorted(dream_entries, key=dream_sort_key)
-
-    categories, subcategories, category_subcats = build_sidebar(entries)
-
     return render_template(
         "dreamboard.html",
         current_page="dreamboard",
         entries=dream_entries,
         themes=themes,
-        priorities=priorities,
+        priorities=PRIORITIES,
         current_theme=current_theme,
         current_priority=current_priority,
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
     )
 
 
@@ -584,38 +719,10 @@ def dreamboard():
 def milestones():
     entries = load_entries()
 
-    def is_milestone(e):
-        prog_raw = e.get("dream_progress") or 0
-        try:
-            prog = int(prog_raw)
-        except (TypeError, ValueError):
-            prog = 0
-
-        tags = [t.lower() for t in e.get("tags", [])]
-        return prog >= 80 or "milestone" in tags
-
-    milestone_entries = [e for e in entries if is_milestone(e)]
-
-    def sort_key(e):
-        prog_raw = e.get("dream_progress") or 0
-        try:
-            prog = int(prog_raw)
-        except (TypeError, ValueError):
-            prog = 0
-        target = e.get("dream_target_date") or ""
-        return (-prog, target)
-
-    milestone_entries = sorted(milestone_entries, key=sort_key)
-
-    categories, subcategories, category_subcats = build_sidebar(entries)
-
     return render_template(
         "milestones.html",
         current_page="milestones",
-        entries=milestone_entries,
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
+        entries=_entry_index(entries)["milestones"],
         current_category=None,
         current_subcategory=None,
     )
@@ -631,10 +738,17 @@ def stats():
     by_subcategory = defaultdict(int)
     by_mood = defaultdict(int)
 
+    today = datetime.today().date()
+    current_year = today.strftime("%Y")
+    this_year_count = 0
+    upcoming = []
+
+    # One pass over entries for every counter
     for e in entries:
-        c = e.get("category")
-        s = e.get("subcategory")
-        m = e.get("mood")
+        get = e.get
+        c = get("category")
+        s = get("subcategory")
+        m = get("mood")
         if c:
             by_category[c] += 1
         if s:
@@ -642,32 +756,21 @@ def stats():
         if m:
             by_mood[m] += 1
 
-    current_year = datetime.today().strftime("%Y")
-    this_year_entries = [
-        e for e in entries if e.get("date") and e["date"].startswith(current_year)
-    ]
-    this_year_count = len(this_year_entries)
+        d = get("date")
+        if d and d.startswith(current_year):
+            this_year_count += 1
 
-    today = datetime.today().date()
-    upcoming = []
-    for e in entries:
-        dstr = e.get("dream_target_date") or ""
-        if not dstr:
-            continue
-        try:
-            d = datetime.strptime(dstr, "%Y-%m-%d").date()
-        except ValueError:
+        target = e["_target_date"]
+        if target is None:
             continue
-        delta = (d - today).days
+        delta = (target - today).days
         if 0 <= delta <= 60:
             upcoming.append((delta, e))
-    upcoming.sort(key=lambda x: x[0])
+    upcoming.sort(key=itemgetter(0))
     upcoming_entries = [e for _, e in upcoming]
 
-    categories, subcategories, category_subcats = build_sidebar(entries)
-
-    top_categories = sorted(by_category.items(), key=lambda x: x[1], reverse=True)
-    top_moods = sorted(by_mood.items(), key=lambda x: x[1], reverse=True)
+    top_categories = sorted(by_category.items(), key=itemgetter(1), reverse=True)
+    top_moods = sorted(by_mood.items(), key=itemgetter(1), reverse=True)
 
     return render_template(
         "stats.html",
@@ -677,9 +780,6 @@ def stats():
         top_categories=top_categories,
         top_moods=top_moods,
         upcoming_entries=upcoming_entries,
-        categories=categories,
-        subcategories=subcategories,
-        category_subcats=category_subcats,
         current_category=None,
         current_subcategory=None,
     )
@@ -712,29 +812,17 @@ def daily_reflection():
                 "dream_target_date": "",
                 "dream_progress": 0,
             }
+            _derive_fields(entry)  # readers of the shared list expect derived fields
             entries.append(entry)
             save_entries(entries)
         return redirect(url_for("daily_reflection"))
 
-    reflections = [
-        e
-        for e in entries
-        if e.get("category") == "Life diary"
-        and e.get("subcategory") == "Daily reflection"
-    ]
-    reflections = sorted(reflections, key=lambda e: e.get("date", ""), reverse=True)[
-        :30
-    ]
-
-    categories, subcategories, category_subcats = build_sidebar(entries)
+    reflections = _entry_index(entries)["reflections"][:30]
 
     return render_template(
         "reflect.html",
         reflections=reflections,
-        categories=categories,
         current_page="daily_reflection",
-        subcategories=subcategories,
-        category_subcats=category_subcats,
         current_category=None,
         current_subcategory=None,
     )